@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the Sentence Transformer API
+
+Run with: gunicorn -c gunicorn_conf.py sentence_transformer_api:app
+
+One worker with many threads: the encoding work happens in BLAS / ONNX
+Runtime kernels that release the GIL, so threads scale on concurrent
+requests without duplicating the ~400 MB model per process the way
+multiple workers would.
+"""
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
+workers = 1
+threads = int(os.environ.get('THREADS', 8))
+worker_class = 'gthread'
+timeout = 120
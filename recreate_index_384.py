@@ -1,13 +1,36 @@
 """
 Recreate Pinecone index with 384 dimensions and upload vectors
 """
-import json
+import base64
+import orjson
+import ijson
 import sys
 import os
-from pinecone import Pinecone, ServerlessSpec
+import itertools
+import numpy as np
+from collections import deque
+from pinecone import Pinecone, ServerlessSpec, NotFoundException
 from typing import List, Dict, Any
 import time
 
+# Maximum number of async upsert batches in flight at once
+MAX_IN_FLIGHT = 30
+
+def chunks(iterable, batch_size: int = 100):
+    """Break an iterable into batches of batch_size"""
+    it = iter(iterable)
+    batch = list(itertools.islice(it, batch_size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(it, batch_size))
+
+def decode_values(vec: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode base64 fp16 values from the scraper's float16 format"""
+    if 'values_fp16_b64' in vec:
+        raw = base64.b64decode(vec.pop('values_fp16_b64'))
+        vec['values'] = np.frombuffer(raw, dtype=np.float16).astype(np.float32).tolist()
+    return vec
+
 def recreate_index_and_upload(
     api_key: str,
     index_name: str,
@@ -23,22 +46,90 @@ def recreate_index_and_upload(
     print(f"\nConnecting to Pinecone...")
     pc = Pinecone(api_key=api_key)
     
-    # Load JSON file
-    print(f"Loading JSON file: {json_file}")
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    vectors = data.get('vectors', [])
-    if not vectors:
-        print("Error: No vectors found in JSON file!")
+    # Load vector file - binary NPZ (embeddings as one float32 matrix,
+    # metadata in a JSONL sidecar) or the legacy JSON format
+    batch_size = 100
+    print(f"Loading file: {json_file}")
+    if json_file.endswith('.npz'):
+        npz = np.load(json_file)
+        ids = npz['ids']
+        embeddings = npz['embeddings']
+        file_namespace = str(npz['namespace']) if 'namespace' in npz else None
+
+        metadata_file = os.path.splitext(json_file)[0] + '.metadata.jsonl'
+        if os.path.exists(metadata_file):
+            with open(metadata_file, 'rb') as f:
+                metadatas = [orjson.loads(line)['metadata'] for line in f if line.strip()]
+        else:
+            print(f"Warning: metadata sidecar '{metadata_file}' not found, uploading without metadata")
+            metadatas = [{} for _ in range(len(ids))]
+
+        total_vectors = len(ids)
+        dimension = embeddings.shape[1]
+
+        # int8-quantized files carry per-vector scale/offset; dequantize
+        # back to float32 at the upsert boundary
+        scales = npz['scales'] if 'scales' in npz else None
+        offsets = npz['offsets'] if 'offsets' in npz else None
+
+        def vector_values(j):
+            if scales is not None:
+                return ((embeddings[j].astype(np.float32) + 128.0) * scales[j]
+                        + offsets[j]).tolist()
+            return embeddings[j].tolist()
+
+        def vector_batches():
+            # Slice the embedding matrix directly; convert to lists only at
+            # the upsert boundary
+            for i in range(0, total_vectors, batch_size):
+                yield [
+                    {
+                        "id": str(ids[j]),
+                        "values": vector_values(j),
+                        "metadata": metadatas[j]
+                    }
+                    for j in range(i, min(i + batch_size, total_vectors))
+                ]
+    else:
+        # Stream-parse the JSON instead of json.load-ing the whole file:
+        # peak memory stays at one batch of vectors rather than N*dim
+        # Python floats
+        with open(json_file, 'rb') as f:
+            file_namespace = next(ijson.items(f, 'namespace'), None)
+        with open(json_file, 'rb') as f:
+            first = next(ijson.items(f, 'vectors.item', use_float=True), None)
+            if first is not None:
+                first = decode_values(first)
+
+        if first is None:
+            print("Error: No vectors found in JSON file!")
+            return
+
+        total_vectors = None  # unknown until the stream is consumed
+        dimension = len(first['values'])
+
+        def vector_batches():
+            with open(json_file, 'rb') as f:
+                formatted = (
+                    {
+                        "id": vec["id"],
+                        "values": vec["values"],
+                        "metadata": vec.get("metadata", {})
+                    }
+                    for vec in map(decode_values, ijson.items(f, 'vectors.item', use_float=True))
+                )
+                yield from chunks(formatted, batch_size)
+
+    if total_vectors == 0:
+        print("Error: No vectors found in file!")
         return
-    
-    file_namespace = data.get('namespace', None)
+
     if not namespace and file_namespace:
         namespace = file_namespace
-    
-    print(f"Loaded {len(vectors)} vectors")
-    print(f"Vector dimension: {len(vectors[0]['values'])}")
+
+    if total_vectors is not None:
+        print(f"Loaded {total_vectors} vectors")
+    print(f"Vector dimension: {dimension}")
     print(f"Namespace: {namespace if namespace else 'default'}")
     
     # Check if index exists
@@ -49,10 +140,18 @@ def recreate_index_and_upload(
         print(f"Index '{index_name}' exists. Deleting it...")
         pc.delete_index(index_name)
         
-        # Wait for deletion to complete
+        # Wait for deletion to complete - describe_index is a single
+        # status lookup instead of serializing the whole index list on
+        # every poll, and the backoff keeps control-plane calls down
         print("Waiting for index deletion...")
-        while index_name in [index.name for index in pc.list_indexes()]:
-            time.sleep(2)
+        backoff = 1.0
+        while True:
+            try:
+                pc.describe_index(index_name)
+            except NotFoundException:
+                break
+            time.sleep(min(30, backoff))
+            backoff *= 2
         print("Index deleted successfully!")
     
     # Create new index with 384 dimensions
@@ -67,64 +166,67 @@ def recreate_index_and_upload(
         )
     )
     
-    # Wait for index to be ready
+    # Wait until the index reports ready - no blind extra sleep needed
     print("Waiting for index to be ready...")
-    while index_name not in [index.name for index in pc.list_indexes()]:
-        time.sleep(2)
-    time.sleep(5)  # Additional wait
+    backoff = 1.0
+    while True:
+        try:
+            if pc.describe_index(index_name).status['ready']:
+                break
+        except NotFoundException:
+            pass
+        time.sleep(min(30, backoff))
+        backoff *= 2
     print("Index created successfully!")
     
-    # Connect to the index
+    # Connect to the index with a thread pool for parallel upserts
     print(f"\nConnecting to index: {index_name}")
-    index = pc.Index(index_name)
-    
+    index = pc.Index(index_name, pool_threads=MAX_IN_FLIGHT)
+
     # Get index stats
     stats = index.describe_index_stats()
     print(f"Index stats: {stats}")
-    
-    # Upload vectors in batches
-    total_vectors = len(vectors)
-    batch_size = 100
-    print(f"\nUploading {total_vectors} vectors to Pinecone...")
+
+    # Upload vectors in parallel batches - upserts are network-bound, so
+    # issuing them with async_req=True and letting pool_threads cap
+    # concurrency is much faster than sequential calls
+    total_label = total_vectors if total_vectors is not None else '?'
+    print(f"\nUploading {total_label} vectors to Pinecone...")
     print(f"Using namespace: {namespace if namespace else 'default'}")
-    print(f"Batch size: {batch_size}")
+    print(f"Batch size: {batch_size} (parallel upserts, {MAX_IN_FLIGHT} batches in flight)")
     print("-" * 60)
-    
+
     uploaded = 0
-    for i in range(0, total_vectors, batch_size):
-        batch = vectors[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (total_vectors + batch_size - 1) // batch_size
-        
-        print(f"Uploading batch {batch_num}/{total_batches} ({len(batch)} vectors)...")
-        
-        try:
-            # Format vectors for Pinecone v8 API
-            formatted_batch = []
-            for vec in batch:
-                formatted_vec = {
-                    "id": vec["id"],
-                    "values": vec["values"],
-                    "metadata": vec.get("metadata", {})
-                }
-                formatted_batch.append(formatted_vec)
-            
-            # Upload batch
+    in_flight = deque()
+
+    def drain_one():
+        """Wait for the oldest in-flight batch and surface any errors"""
+        nonlocal uploaded
+        result, batch_len = in_flight.popleft()
+        result.get()
+        uploaded += batch_len
+        print(f"  [OK] Uploaded {uploaded}/{total_label} vectors")
+
+    try:
+        # Keep at most MAX_IN_FLIGHT batches submitted at once - letting
+        # every batch queue up front would buffer the whole file in the
+        # pool's task queue and undo the streaming parser's memory win
+        for batch in vector_batches():
             if namespace:
-                index.upsert(vectors=formatted_batch, namespace=namespace)
+                result = index.upsert(vectors=batch, namespace=namespace, async_req=True)
             else:
-                index.upsert(vectors=formatted_batch)
-            
-            uploaded += len(batch)
-            print(f"  [OK] Uploaded {uploaded}/{total_vectors} vectors")
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"  [ERROR] Error uploading batch: {str(e)}")
-            raise
-    
+                result = index.upsert(vectors=batch, async_req=True)
+            in_flight.append((result, len(batch)))
+            if len(in_flight) >= MAX_IN_FLIGHT:
+                drain_one()
+
+        while in_flight:
+            drain_one()
+
+    except Exception as e:
+        print(f"  [ERROR] Error uploading batch: {str(e)}")
+        raise
+
     print("-" * 60)
     print(f"\n[SUCCESS] Successfully uploaded {uploaded} vectors to Pinecone!")
     
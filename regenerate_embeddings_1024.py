@@ -1,9 +1,10 @@
 """
 Regenerate embeddings with a model that produces 1024 dimensions
 """
-import json
+import orjson
+import ijson
+import torch
 from sentence_transformers import SentenceTransformer
-import time
 
 def regenerate_embeddings(input_file: str, output_file: str, model_name: str = "sentence-transformers/all-mpnet-base-v2"):
     """
@@ -13,19 +14,38 @@ def regenerate_embeddings(input_file: str, output_file: str, model_name: str = "
     For 1024 dimensions, we might need to use OpenAI or another service
     """
     print(f"Loading model: {model_name}...")
-    model = SentenceTransformer(model_name)
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = SentenceTransformer(model_name, device=device)
+    if device == 'cuda':
+        # FP16 inference on GPU is much faster than FP32 for these models
+        model = model.half()
+    print(f"Using device: {device}")
     
-    # Load existing JSON
+    # Stream-parse the existing JSON: the old embedding values are being
+    # replaced anyway, so keep only ids and metadata and let the parser
+    # discard each values array as it goes - peak memory stays bounded
     print(f"Loading {input_file}...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    vectors = data.get('vectors', [])
+    with open(input_file, 'rb') as f:
+        namespace = next(ijson.items(f, 'namespace'), None)
+    with open(input_file, 'rb') as f:
+        file_metadata = next(ijson.items(f, 'metadata', use_float=True), {})
+
+    current_dim = None
+    vectors = []
+    with open(input_file, 'rb') as f:
+        for vec in ijson.items(f, 'vectors.item', use_float=True):
+            if current_dim is None:
+                current_dim = len(vec['values'])
+            vectors.append({'id': vec['id'], 'metadata': vec['metadata']})
+
+    data = {'vectors': [], 'metadata': dict(file_metadata)}
+    if namespace:
+        data['namespace'] = namespace
+
     print(f"Found {len(vectors)} vectors to regenerate")
-    
+
     # Check current dimension
-    if vectors:
-        current_dim = len(vectors[0]['values'])
+    if current_dim is not None:
         print(f"Current embedding dimension: {current_dim}")
     
     # Regenerate embeddings
@@ -33,25 +53,26 @@ def regenerate_embeddings(input_file: str, output_file: str, model_name: str = "
     print("(This model produces 768 dimensions, not 1024)")
     print("For 1024 dimensions, you may need to use OpenAI's text-embedding-3-small model")
     
+    # Encode all texts in one batched call - the model runs locally, so no
+    # rate limiting is needed and batching amortizes tokenization overhead
+    texts = [vec['metadata']['text'] for vec in vectors]
+    embeddings = model.encode(
+        texts,
+        batch_size=64,
+        convert_to_numpy=True,
+        show_progress_bar=True
+    )
+
     new_vectors = []
-    for i, vec in enumerate(vectors, 1):
-        text = vec['metadata']['text']
-        print(f"Processing vector {i}/{len(vectors)}...")
-        
-        # Generate new embedding
-        embedding = model.encode(text, convert_to_numpy=True).tolist()
-        
-        # Update vector
+    for vec, embedding in zip(vectors, embeddings):
         new_vec = {
             'id': vec['id'],
             'values': embedding,
             'metadata': vec['metadata']
         }
         new_vectors.append(new_vec)
-        
-        time.sleep(0.1)  # Rate limiting
     
-    # Update data
+    # Update data - orjson serializes the numpy arrays directly
     data['vectors'] = new_vectors
     new_dim = len(new_vectors[0]['values']) if new_vectors else 0
     data['metadata']['embedding_dimension'] = new_dim
@@ -59,8 +80,11 @@ def regenerate_embeddings(input_file: str, output_file: str, model_name: str = "
     
     # Save
     print(f"\nSaving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(
+            data,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+        ))
     
     print(f"Done! New embedding dimension: {new_dim}")
     print(f"Note: Your index expects 1024 dimensions.")
@@ -1,82 +1,115 @@
 """
 Regenerate embeddings using OpenAI API to match 1024 dimensions required by Pinecone index
 """
-import json
+import orjson
+import ijson
 import os
-from openai import OpenAI
-import time
+import asyncio
+from openai import AsyncOpenAI
 
-def regenerate_embeddings_openai(input_file: str, output_file: str, api_key: str):
+# Batch up to 256 texts per request and keep up to 20 requests in flight -
+# the API accepts an input array, so this replaces one round-trip per
+# vector with a handful of overlapping batched calls
+BATCH_SIZE = 256
+MAX_CONCURRENT_REQUESTS = 20
+
+async def regenerate_embeddings_openai(input_file: str, output_file: str, api_key: str):
     """
     Regenerate embeddings using OpenAI's text-embedding-3-small model
     Configured to produce 1024 dimensions to match Pinecone index
     """
-    client = OpenAI(api_key=api_key)
-    
-    # Load existing JSON
+    client = AsyncOpenAI(api_key=api_key)
+
+    # Stream-parse the existing JSON: the old embedding values are being
+    # replaced anyway, so keep only ids and metadata and let the parser
+    # discard each values array as it goes - peak memory stays bounded
     print(f"Loading {input_file}...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    vectors = data.get('vectors', [])
+    with open(input_file, 'rb') as f:
+        namespace = next(ijson.items(f, 'namespace'), None)
+    with open(input_file, 'rb') as f:
+        file_metadata = next(ijson.items(f, 'metadata', use_float=True), {})
+
+    current_dim = None
+    vectors = []
+    with open(input_file, 'rb') as f:
+        for vec in ijson.items(f, 'vectors.item', use_float=True):
+            if current_dim is None:
+                current_dim = len(vec['values'])
+            vectors.append({'id': vec['id'], 'metadata': vec['metadata']})
+
     print(f"Found {len(vectors)} vectors to regenerate")
-    
+
     if not vectors:
         print("No vectors found!")
         return
-    
+
+    data = {'vectors': [], 'metadata': dict(file_metadata)}
+    if namespace:
+        data['namespace'] = namespace
+
     # Check current dimension
-    current_dim = len(vectors[0]['values'])
     print(f"Current embedding dimension: {current_dim}")
     print(f"Target dimension: 1024")
-    
+
     # Regenerate embeddings
     print(f"\nRegenerating embeddings with OpenAI text-embedding-3-small (1024 dims)...")
+    print(f"Batch size: {BATCH_SIZE}, max concurrent requests: {MAX_CONCURRENT_REQUESTS}")
     print("-" * 60)
-    
-    new_vectors = []
-    for i, vec in enumerate(vectors, 1):
-        text = vec['metadata']['text']
-        print(f"Processing vector {i}/{len(vectors)}...", end='\r')
-        
-        try:
-            # Generate embedding with 1024 dimensions
-            response = client.embeddings.create(
+
+    texts = [vec['metadata']['text'] for vec in vectors]
+    batches = [texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def embed_batch(batch_texts):
+        async with sem:
+            response = await client.embeddings.create(
                 model="text-embedding-3-small",
-                input=text,
+                input=batch_texts,
                 dimensions=1024  # Specify 1024 dimensions
             )
-            
-            embedding = response.data[0].embedding
-            
-            # Update vector
-            new_vec = {
+            return [item.embedding for item in response.data]
+
+    results = await asyncio.gather(*[embed_batch(b) for b in batches],
+                                   return_exceptions=True)
+
+    # Keep the successful batches and skip failures instead of aborting
+    # the whole run - one batch exhausting the SDK's retries should not
+    # throw away every other vector of a long job
+    new_vectors = []
+    failed_batches = 0
+    for batch_idx, result in enumerate(results):
+        if isinstance(result, Exception):
+            failed_batches += 1
+            print(f"  [ERROR] Batch {batch_idx + 1}/{len(batches)} failed: {result}")
+            continue
+        start = batch_idx * BATCH_SIZE
+        for vec, embedding in zip(vectors[start:start + BATCH_SIZE], result):
+            new_vectors.append({
                 'id': vec['id'],
                 'values': embedding,
                 'metadata': vec['metadata']
-            }
-            new_vectors.append(new_vec)
-            
-            time.sleep(0.1)  # Rate limiting
-            
-        except Exception as e:
-            print(f"\nError processing vector {i}: {str(e)}")
-            continue
-    
+            })
+
     print(f"\n{'=' * 60}")
-    print(f"Processed {len(new_vectors)} vectors")
-    
+    print(f"Processed {len(new_vectors)}/{len(vectors)} vectors")
+    if failed_batches:
+        print(f"Skipped {failed_batches} failed batch(es) "
+              f"({len(vectors) - len(new_vectors)} vectors missing)")
+    if not new_vectors:
+        print("No embeddings were generated; nothing to save.")
+        return
+
     # Update data
     data['vectors'] = new_vectors
     new_dim = len(new_vectors[0]['values']) if new_vectors else 0
     data['metadata']['embedding_dimension'] = new_dim
     data['metadata']['embedding_model'] = 'text-embedding-3-small'
-    
+
     # Save
     print(f"\nSaving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
     print(f"Done! New embedding dimension: {new_dim}")
     print(f"File saved: {output_file}")
 
@@ -84,10 +117,10 @@ if __name__ == "__main__":
     print("=" * 60)
     print("Regenerate Embeddings for 1024-Dimension Pinecone Index")
     print("=" * 60)
-    
+
     input_file = "pinecone_vectors_groww.json"
     output_file = "pinecone_vectors_groww_1024.json"
-    
+
     # Get OpenAI API key
     api_key = os.getenv('OPENAI_API_KEY', '')
     if not api_key:
@@ -95,10 +128,9 @@ if __name__ == "__main__":
         if not api_key:
             print("Error: API key is required!")
             exit(1)
-    
-    regenerate_embeddings_openai(input_file, output_file, api_key)
+
+    asyncio.run(regenerate_embeddings_openai(input_file, output_file, api_key))
     print("\n" + "=" * 60)
     print("You can now upload the new file to Pinecone:")
     print(f"python upload_to_pinecone_simple.py <api_key> mutualfundfees {output_file}")
     print("=" * 60)
-
@@ -1,14 +1,174 @@
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter, Retry
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 from bs4 import BeautifulSoup
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+try:
+    import numba
+except ImportError:
+    numba = None
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
 import pdfplumber
-import json
+import orjson
 import re
+import base64
 from typing import List, Dict, Any
 from urllib.parse import urlparse
 import hashlib
+import os
+import threading
 import time
+from io import BytesIO
+from functools import lru_cache
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
-import os
+
+@lru_cache(maxsize=1024)
+def _source_hash(source: str) -> str:
+    """
+    Short hash of a source URL for chunk IDs
+
+    xxh3 is an order of magnitude faster than MD5 and plenty for a dedup
+    tag; cached so the hash is computed once per URL, not once per chunk.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(source)[:8]
+    return hashlib.md5(source.encode()).hexdigest()[:8]
+
+def _quantize_int8(embeddings):
+    """
+    Per-vector affine int8 quantization
+
+    Maps each vector's [min, max] range onto [-128, 127]. Recall loss for
+    cosine retrieval is typically under 1% while the payload shrinks 4x.
+
+    Args:
+        embeddings: (N, dim) float32 array
+
+    Returns:
+        Tuple of (int8 array, per-vector scales, per-vector offsets);
+        dequantize with (q + 128) * scale + offset
+    """
+    mins = embeddings.min(axis=1, keepdims=True)
+    maxs = embeddings.max(axis=1, keepdims=True)
+    scales = (maxs - mins) / 255.0
+    scales[scales == 0] = 1.0
+    quantized = np.round((embeddings - mins) / scales - 128.0).astype(np.int8)
+    return quantized, scales[:, 0], mins[:, 0]
+
+# Precompiled whitespace normalizer for extracted text
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Precompiled sentence-boundary pattern used by the chunker
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _ascii_sentence_spans(buf):
+        """
+        Sentence spans for pure-ASCII text as an (m, 2) int64 array
+
+        One branchy linear scan over the byte buffer, compiled to native
+        code - no Python object is created per sentence. Mirrors
+        SENTENCE_SPLIT_RE: a sentence ends at [.!?] followed by a
+        whitespace run.
+        """
+        n = buf.shape[0]
+        # Each boundary needs at least 2 bytes, so n//2+1 spans is a
+        # safe upper bound
+        spans = np.empty((n // 2 + 1, 2), dtype=np.int64)
+        m = 0
+        prev = 0
+        i = 0
+        while i < n - 1:
+            c = buf[i]
+            if c == 46 or c == 33 or c == 63:  # . ! ?
+                d = buf[i + 1]
+                if d == 32 or (9 <= d <= 13):  # whitespace
+                    spans[m, 0] = prev
+                    spans[m, 1] = i + 1
+                    m += 1
+                    k = i + 1
+                    while k < n and (buf[k] == 32 or (9 <= buf[k] <= 13)):
+                        k += 1
+                    prev = k
+                    i = k
+                    continue
+            i += 1
+        if prev < n:
+            spans[m, 0] = prev
+            spans[m, 1] = n
+            m += 1
+        return spans[:m]
+else:
+    _ascii_sentence_spans = None
+
+# Optional Hyperscan database for stripping script/style blocks from raw
+# HTML in one JIT-compiled multi-pattern scan before parsing
+_HS_DB = None
+
+# Lazy regex that does the actual block removal when Hyperscan reports
+# a hit; one alternation so the document is rewritten in a single pass
+_SCRIPT_STYLE_RE = re.compile(
+    rb'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>',
+    re.IGNORECASE | re.DOTALL
+)
+
+def _get_hyperscan_db():
+    global _HS_DB
+    if _HS_DB is None and hyperscan is not None:
+        db = hyperscan.Database()
+        flags = hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_CASELESS
+        db.compile(
+            expressions=[rb'<script[^>]*>.*?</script>',
+                         rb'<style[^>]*>.*?</style>'],
+            ids=[0, 1],
+            elements=2,
+            flags=[flags, flags]
+        )
+        _HS_DB = db
+    return _HS_DB
+
+def _hyperscan_strip(html_bytes: bytes) -> bytes:
+    """
+    Remove script/style blocks, using Hyperscan only as a prefilter
+
+    Hyperscan answers "does any block exist?" in one native scan, but
+    the removal itself runs through the lazy Python regex: Hyperscan's
+    automaton ignores laziness and can report a span stretching from one
+    block's open tag to a later block's close tag, so splicing its spans
+    out would delete legitimate content between blocks.
+    """
+    db = _get_hyperscan_db()
+    if db is None:
+        return html_bytes
+
+    matched = []
+    db.scan(html_bytes,
+            match_event_handler=lambda _id, _start, _end, _flags, _ctx:
+                matched.append(True))
+    if not matched:
+        return html_bytes
+    return _SCRIPT_STYLE_RE.sub(b'', html_bytes)
 
 class WebScraperToPinecone:
     def __init__(self, embedding_model: str = "all-MiniLM-L6-v2", chunk_size: int = 2000, chunk_overlap: int = 200):
@@ -26,9 +186,39 @@ class WebScraperToPinecone:
         self.chunk_overlap = chunk_overlap
         self.embedding_model_name = embedding_model
         print(f"Loading embedding model: {embedding_model}...")
-        self.embedding_model = SentenceTransformer(embedding_model)
-        print(f"Embedding model loaded successfully!")
-        self.vectors = []
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.embedding_model = SentenceTransformer(embedding_model, device=device)
+        if device == 'cuda':
+            # FP16 inference on GPU: tensor-core matmuls are much faster than
+            # FP32 and halve activation memory, with negligible quality loss
+            self.embedding_model = self.embedding_model.half()
+        print(f"Embedding model loaded successfully! (device: {device})")
+        # Structure-of-arrays storage: ids and metadata stay as Python
+        # lists, embeddings as float32 numpy rows that are stacked into a
+        # single (N, dim) matrix at save time. Avoids materializing
+        # thousands of per-float Python objects per vector.
+        self.ids: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.embeddings: List[Any] = []
+
+        # Reusable per-thread BytesIO for PDF parsing (thread-local
+        # because extraction may run in worker threads)
+        self._pdf_buffers = threading.local()
+
+        # Pooled session with keep-alive: re-uses TCP+TLS connections
+        # across requests to the same host instead of a fresh handshake
+        # per URL
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
     def fetch_url(self, url: str) -> Dict[str, Any]:
         """
@@ -41,10 +231,7 @@ class WebScraperToPinecone:
             Dictionary with content type and data
         """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
             content_type = response.headers.get('content-type', '').lower()
@@ -77,29 +264,75 @@ class WebScraperToPinecone:
     def extract_text_from_html(self, html_content: str) -> str:
         """
         Extract text from HTML content
-        
+
+        Uses selectolax (C-based Modest engine) when available - it is
+        several times faster than BeautifulSoup and avoids building a full
+        Python tree. Falls back to BeautifulSoup with the lxml parser.
+
         Args:
             html_content: HTML content as string
-            
+
         Returns:
             Extracted text
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "meta", "link"]):
-            script.decompose()
-        
-        # Get text
-        text = soup.get_text()
-        
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text
+        # Pre-strip script/style blocks with Hyperscan when available so
+        # the parser never sees them; the parser-level decompose below
+        # stays as the fallback
+        if hyperscan is not None:
+            try:
+                html_content = _hyperscan_strip(
+                    html_content.encode('utf-8')).decode('utf-8', 'ignore')
+            except Exception:
+                pass
+
+        if HTMLParser is not None:
+            tree = HTMLParser(html_content)
+            # Remove script and style elements
+            for tag in tree.css('script, style, meta, link'):
+                tag.decompose()
+            body = tree.body if tree.body is not None else tree.root
+            text = body.text(separator=' ') if body is not None else ''
+        else:
+            # lxml is libxml2 under the hood - much faster than the
+            # pure-Python 'html.parser' backend
+            try:
+                soup = BeautifulSoup(html_content, 'lxml')
+            except Exception:
+                soup = BeautifulSoup(html_content, 'html.parser')
+
+            # Remove script and style elements
+            for script in soup(["script", "style", "meta", "link"]):
+                script.decompose()
+
+            text = soup.get_text()
+
+        # Clean up whitespace in a single precompiled-regex pass
+        return WHITESPACE_RE.sub(' ', text).strip()
     
+    def _pdf_buffer(self, pdf_content: bytes) -> BytesIO:
+        """
+        Fill and return this thread's reusable BytesIO
+
+        Reusing one buffer via seek/truncate/write avoids allocating a
+        fresh BytesIO (and its backing storage) for every PDF when batch
+        scraping.
+
+        Args:
+            pdf_content: PDF content as bytes
+
+        Returns:
+            BytesIO positioned at the start of the content
+        """
+        buf = getattr(self._pdf_buffers, 'buf', None)
+        if buf is None or buf.closed:
+            buf = BytesIO()
+            self._pdf_buffers.buf = buf
+        buf.seek(0)
+        buf.truncate()
+        buf.write(pdf_content)
+        buf.seek(0)
+        return buf
+
     def extract_text_from_pdf(self, pdf_content: bytes) -> str:
         """
         Extract text from PDF content
@@ -110,17 +343,31 @@ class WebScraperToPinecone:
         Returns:
             Extracted text
         """
-        text = ""
+        # Fast path: PyMuPDF wraps MuPDF's C extractor and is an order of
+        # magnitude faster than pdfplumber's per-character object model
+        if fitz is not None:
+            try:
+                doc = fitz.open(stream=pdf_content, filetype="pdf")
+                text = "\n".join(page.get_text("text") for page in doc)
+                page_count = len(doc)
+                doc.close()
+                if text.strip():
+                    print(f"  Extracted text from {page_count} pages (PyMuPDF)")
+                    return text.strip()
+                print(f"  Warning: No text found in PDF (might be image-based/scanned), trying pdfplumber...")
+            except Exception as e:
+                print(f"  PyMuPDF failed: {str(e)}, trying pdfplumber...")
+
+        # Accumulate page texts in a list and join once - repeated `+=` on
+        # an ever-larger str is quadratic in total document size
+        pages = []
         try:
-            # Use BytesIO to handle PDF content
-            from io import BytesIO
-            with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+            with pdfplumber.open(self._pdf_buffer(pdf_content)) as pdf:
                 print(f"  PDF has {len(pdf.pages)} pages")
                 for i, page in enumerate(pdf.pages, 1):
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
-                        print(f"  Extracted text from page {i}: {len(page_text)} characters")
+                        pages.append(page_text)
                     else:
                         print(f"  Warning: No text found on page {i} (might be image-based/scanned PDF)")
         except Exception as e:
@@ -129,18 +376,17 @@ class WebScraperToPinecone:
             # Try alternative: PyPDF2 as fallback
             try:
                 import PyPDF2
-                from io import BytesIO
-                pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_content))
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                pdf_reader = PyPDF2.PdfReader(self._pdf_buffer(pdf_content))
+                pages = [
+                    page_text for page in pdf_reader.pages
+                    if (page_text := page.extract_text())
+                ]
                 print(f"  Successfully extracted text using PyPDF2 fallback")
             except Exception as e2:
                 print(f"  PyPDF2 also failed: {str(e2)}")
                 print(f"  Note: This PDF may require OCR (Optical Character Recognition) for image-based PDFs")
-        
-        return text.strip()
+
+        return "\n".join(pages).strip()
     
     def chunk_text(self, text: str, source: str) -> List[Dict[str, Any]]:
         """
@@ -155,49 +401,65 @@ class WebScraperToPinecone:
         """
         if not text:
             return []
-        
+
         chunks = []
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        current_chunk = ""
-        chunk_index = 0
-        start_char = 0
-        
-        for sentence in sentences:
-            # Check if adding this sentence would exceed chunk size
-            if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
-                # Save current chunk
-                chunk_id = self.generate_chunk_id(source, chunk_index)
-                chunks.append({
-                    'text': current_chunk.strip(),
-                    'chunk_index': chunk_index,
-                    'source': source,
-                    'start_char': start_char,
-                    'end_char': start_char + len(current_chunk),
-                    'chunk_id': chunk_id
-                })
-                
-                # Start new chunk with overlap
-                words = current_chunk.split()
-                overlap_words = words[-int(self.chunk_overlap / 10):]  # Approximate word overlap
-                current_chunk = ' '.join(overlap_words) + ' ' + sentence
-                start_char = chunks[-1]['end_char'] - len(' '.join(overlap_words))
-                chunk_index += 1
-            else:
-                current_chunk += sentence + ' '
-        
-        # Add remaining chunk
-        if current_chunk.strip():
+
+        # Find sentence spans with a single linear scan - no list of
+        # sentence strings is materialized, chunks are sliced straight
+        # out of the source text. Pure-ASCII text (the common case for
+        # these documents) goes through the JIT-compiled byte scanner.
+        if _ascii_sentence_spans is not None and text.isascii():
+            spans = _ascii_sentence_spans(
+                np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            )
+        else:
+            spans = []
+            prev_end = 0
+            for match in SENTENCE_SPLIT_RE.finditer(text):
+                spans.append((prev_end, match.start()))
+                prev_end = match.end()
+            if prev_end < len(text):
+                spans.append((prev_end, len(text)))
+
+        def emit_chunk(chunk_index: int, start_char: int, end_char: int):
             chunk_id = self.generate_chunk_id(source, chunk_index)
             chunks.append({
-                'text': current_chunk.strip(),
+                'text': text[start_char:end_char].strip(),
                 'chunk_index': chunk_index,
                 'source': source,
-                'start_char': start_char,
-                'end_char': start_char + len(current_chunk),
+                # int() in case the spans came from the numba scanner
+                'start_char': int(start_char),
+                'end_char': int(end_char),
                 'chunk_id': chunk_id
             })
-        
+
+        chunk_index = 0
+        chunk_start = None
+        chunk_end = None
+
+        for start, end in spans:
+            if chunk_start is None:
+                chunk_start, chunk_end = start, end
+                continue
+
+            # Check if adding this sentence would exceed chunk size
+            if end - chunk_start > self.chunk_size:
+                emit_chunk(chunk_index, chunk_start, chunk_end)
+                chunk_index += 1
+
+                # Start the new chunk chunk_overlap characters before the
+                # previous chunk's end, snapped forward to a word boundary
+                overlap_start = max(chunk_start, chunk_end - self.chunk_overlap)
+                word_boundary = text.find(' ', overlap_start)
+                if 0 <= word_boundary < chunk_end:
+                    overlap_start = word_boundary + 1
+                chunk_start = overlap_start
+            chunk_end = end
+
+        # Add remaining chunk
+        if chunk_start is not None and text[chunk_start:chunk_end].strip():
+            emit_chunk(chunk_index, chunk_start, chunk_end)
+
         return chunks
     
     def generate_chunk_id(self, source: str, chunk_index: int) -> str:
@@ -211,27 +473,51 @@ class WebScraperToPinecone:
         Returns:
             Unique chunk ID
         """
-        # Create a hash from the source URL
-        source_hash = hashlib.md5(source.encode()).hexdigest()[:8]
-        return f"{source_hash}_chunk_{chunk_index}"
+        # Create a hash from the source URL (memoized per source)
+        return f"{_source_hash(source)}_chunk_{chunk_index}"
     
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embeddings(self, texts: List[str]):
         """
-        Generate embedding for text using Sentence Transformers
-        
+        Generate embeddings for a batch of texts using Sentence Transformers
+
+        Encoding all texts in one call lets the model tokenize and run the
+        transformer in large batches instead of one forward pass per chunk.
+
         Args:
-            text: Text to embed
-            
+            texts: List of texts to embed
+
         Returns:
-            Embedding vector
+            Numpy array of embeddings (one row per text), or None on error
         """
         try:
-            # Generate embedding using sentence transformers
-            embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            # Deduplicate identical texts first - scraped filings repeat
+            # boilerplate headers/footers across pages, and the transformer
+            # forward pass is the expensive part. Each unique text is
+            # embedded once and the result scattered back to all positions.
+            seen = {}
+            unique_texts = []
+            indices = []
+            for text in texts:
+                key = xxhash.xxh3_128_intdigest(text) if xxhash is not None else text
+                if key not in seen:
+                    seen[key] = len(unique_texts)
+                    unique_texts.append(text)
+                indices.append(seen[key])
+
+            if len(unique_texts) < len(texts):
+                print(f"Deduplicated {len(texts)} chunks down to {len(unique_texts)} unique texts")
+
+            # Generate embeddings in batches using sentence transformers
+            unique_embeddings = self.embedding_model.encode(
+                unique_texts,
+                batch_size=64,
+                convert_to_numpy=True,
+                show_progress_bar=True
+            )
+            return unique_embeddings[indices]
         except Exception as e:
-            print(f"Error generating embedding: {str(e)}")
-            return []
+            print(f"Error generating embeddings: {str(e)}")
+            return None
     
     def process_url(self, url: str, generate_embeddings: bool = True) -> List[Dict[str, Any]]:
         """
@@ -245,12 +531,27 @@ class WebScraperToPinecone:
             List of vector dictionaries
         """
         print(f"Processing: {url}")
-        
+
         # Fetch URL
         fetched_data = self.fetch_url(url)
         if not fetched_data:
             return []
-        
+
+        return self._vectors_from_fetched(fetched_data, generate_embeddings)
+
+    def _vectors_from_fetched(self, fetched_data: Dict[str, Any], generate_embeddings: bool = True) -> List[Dict[str, Any]]:
+        """
+        Extract text from fetched content, chunk it, and build vectors
+
+        Args:
+            fetched_data: Result of fetch_url/_afetch
+            generate_embeddings: Whether to generate embeddings
+
+        Returns:
+            List of vector dictionaries
+        """
+        url = fetched_data['url']
+
         # Extract text based on content type
         if fetched_data['type'] == 'pdf':
             text = self.extract_text_from_pdf(fetched_data['content'])
@@ -285,61 +586,287 @@ class WebScraperToPinecone:
                     'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
                 }
             }
-            
-            # Generate embedding if requested
-            if generate_embeddings:
-                embedding = self.generate_embedding(chunk['text'])
-                if embedding:
-                    vector_data['values'] = embedding
-                    vectors.append(vector_data)
-            else:
-                # Store without embedding (you can generate embeddings later)
-                vectors.append(vector_data)
-        
+            vectors.append(vector_data)
+
+        # Generate embeddings for all chunks in one batched call
+        if generate_embeddings and vectors:
+            texts = [v['metadata']['text'] for v in vectors]
+            embeddings = self.generate_embeddings(texts)
+            if embeddings is None:
+                return []
+            for vector_data, embedding in zip(vectors, embeddings):
+                vector_data['values'] = embedding
+
         return vectors
     
+    async def _afetch(self, url: str, session) -> Dict[str, Any]:
+        """
+        Fetch content from a URL with aiohttp (async version of fetch_url)
+
+        Args:
+            url: URL to fetch
+            session: aiohttp.ClientSession
+
+        Returns:
+            Dictionary with content type and data
+        """
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                response.raise_for_status()
+
+                content_type = response.headers.get('content-type', '').lower()
+
+                # Check if it's a PDF
+                if url.lower().endswith('.pdf') or 'application/pdf' in content_type:
+                    return {
+                        'type': 'pdf',
+                        'content': await response.read(),
+                        'url': url
+                    }
+                # Check if it's HTML
+                elif 'text/html' in content_type or url.lower().endswith(('.html', '.htm')):
+                    return {
+                        'type': 'html',
+                        'content': await response.text(),
+                        'url': url
+                    }
+                else:
+                    # Try to parse as text
+                    return {
+                        'type': 'text',
+                        'content': await response.text(),
+                        'url': url
+                    }
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return None
+
+    async def _scrape_urls_async(self, urls: List[str], generate_embeddings: bool, max_concurrency: int = 8) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch all URLs concurrently, then parse/embed in worker threads
+
+        Args:
+            urls: List of URLs to scrape
+            generate_embeddings: Whether to generate embeddings
+            max_concurrency: Maximum number of in-flight fetches
+
+        Returns:
+            List of vector lists, one per successfully fetched URL
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+
+        async def fetch_one(url):
+            async with sem:
+                print(f"Processing: {url}")
+                return await self._afetch(url, session)
+
+        async with aiohttp.ClientSession(headers=headers) as session:
+            fetched = await asyncio.gather(*[fetch_one(url) for url in urls])
+
+        # PDF/HTML extraction is CPU-bound; run it in threads so parsing
+        # of one document overlaps with another
+        return await asyncio.gather(*[
+            asyncio.to_thread(self._vectors_from_fetched, data, generate_embeddings)
+            for data in fetched if data
+        ])
+
     def scrape_urls(self, urls: List[str], generate_embeddings: bool = True) -> None:
         """
         Scrape multiple URLs and collect vectors
-        
+
+        Fetches concurrently with aiohttp when available (network latency
+        dominates the serial loop); falls back to the sequential path
+        otherwise.
+
         Args:
             urls: List of URLs to scrape
             generate_embeddings: Whether to generate embeddings
         """
-        for url in urls:
-            vectors = self.process_url(url, generate_embeddings)
-            self.vectors.extend(vectors)
-            time.sleep(1)  # Rate limiting between URLs
+        if aiohttp is not None:
+            vector_lists = asyncio.run(
+                self._scrape_urls_async(urls, generate_embeddings)
+            )
+            for vectors in vector_lists:
+                self._store_vectors(vectors)
+        else:
+            for url in urls:
+                vectors = self.process_url(url, generate_embeddings)
+                self._store_vectors(vectors)
+
+    def _store_vectors(self, vectors: List[Dict[str, Any]]) -> None:
+        """
+        Append per-URL vector dicts into the structure-of-arrays storage
+
+        Only vectors carrying embedding values are stored: the save
+        methods pair ids, metadatas and embeddings positionally, so the
+        three arrays must stay index-aligned even when scrape runs mix
+        generate_embeddings=True and False.
+
+        Args:
+            vectors: List of vector dictionaries from _vectors_from_fetched
+        """
+        for vector_data in vectors:
+            if 'values' not in vector_data:
+                continue
+            self.ids.append(vector_data['id'])
+            self.metadatas.append(vector_data['metadata'])
+            self.embeddings.append(vector_data['values'])
     
-    def save_to_pinecone_json(self, output_file: str, namespace: str = "mutual-fund-docs") -> None:
+    def save_to_pinecone_json(self, output_file: str, namespace: str = "mutual-fund-docs", precision: str = "float32") -> None:
         """
         Save vectors to Pinecone-compatible JSON file
-        
+
         Args:
             output_file: Output file path
             namespace: Pinecone namespace
+            precision: "float32" (default) or "float16" for
+                       base64-encoded fp16 bytes (~6x smaller than
+                       decimal text). For int8 use save_to_npz - the
+                       JSON upload path has no dequantizing reader, so
+                       an int8 JSON file would upsert raw quantized
+                       integers as coordinates.
         """
-        # Filter vectors that have embeddings
-        vectors_with_embeddings = [v for v in self.vectors if 'values' in v]
-        
+        if precision == "int8":
+            raise ValueError(
+                "int8 is only supported by save_to_npz; "
+                "use precision='float16' for a compact JSON file"
+            )
+
+        # Assemble vector dicts only here, at the serialization boundary -
+        # orjson serializes the numpy rows directly, so no .tolist()
+        # round-trip is needed
+        n = len(self.embeddings)
+        if precision == "float16" and n > 0:
+            # Base64-encoded fp16 bytes instead of decimal text: each
+            # component costs 2 raw bytes (~2.7 after base64) rather than
+            # ~12 characters, so files shrink and uploads move less data
+            vectors_with_embeddings = [
+                {
+                    'id': self.ids[i],
+                    'values_fp16_b64': base64.b64encode(
+                        np.asarray(self.embeddings[i], dtype=np.float16).tobytes()
+                    ).decode('ascii'),
+                    'metadata': self.metadatas[i]
+                }
+                for i in range(n)
+            ]
+        else:
+            vectors_with_embeddings = [
+                {
+                    'id': self.ids[i],
+                    'values': self.embeddings[i],
+                    'metadata': self.metadatas[i]
+                }
+                for i in range(n)
+            ]
+
         pinecone_data = {
             'vectors': vectors_with_embeddings,
             'namespace': namespace,
             'metadata': {
-                'total_vectors': len(vectors_with_embeddings),
-                'total_chunks': len(self.vectors),
+                'total_vectors': n,
+                'total_chunks': len(self.ids),
+                'precision': precision,
                 'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
-                'sources': list(set([v['metadata']['source'] for v in vectors_with_embeddings]))
+                'sources': list(set(m['source'] for m in self.metadatas[:n]))
             }
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(pinecone_data, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(
+                pinecone_data,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            ))
         
-        print(f"\nSaved {len(vectors_with_embeddings)} vectors to {output_file}")
-        print(f"Total chunks processed: {len(self.vectors)}")
+        print(f"\nSaved {n} vectors to {output_file}")
+        print(f"Total chunks processed: {len(self.ids)}")
         print(f"Sources: {len(pinecone_data['metadata']['sources'])} unique URLs")
 
+    def save_to_npz(self, output_file: str, namespace: str = "mutual-fund-docs", precision: str = "float32") -> None:
+        """
+        Save vectors to a binary NPZ file plus a metadata JSONL sidecar
+
+        Storing the embeddings as one float32 matrix avoids the ~4x size
+        blow-up of printing each float as decimal text, and lets upload
+        scripts slice batches straight out of the array without parsing.
+
+        Args:
+            output_file: Output file path (should end in .npz)
+            namespace: Pinecone namespace
+            precision: "float32" (default) or "int8" for affine-quantized
+                       values with per-vector scale/offset (4x smaller)
+        """
+        n = len(self.embeddings)
+        if n == 0:
+            print("No vectors with embeddings to save!")
+            return
+
+        ids = np.array(self.ids[:n])
+        embeddings = np.stack([
+            np.asarray(row) for row in self.embeddings
+        ]).astype(np.float32)
+
+        if precision == "int8":
+            quantized, scales, offsets = _quantize_int8(embeddings)
+            np.savez(output_file, ids=ids, embeddings=quantized,
+                     scales=scales, offsets=offsets,
+                     namespace=np.array(namespace))
+        else:
+            np.savez(output_file, ids=ids, embeddings=embeddings,
+                     namespace=np.array(namespace))
+
+        # Compact metadata sidecar: one JSON record per vector
+        metadata_file = os.path.splitext(output_file)[0] + '.metadata.jsonl'
+        with open(metadata_file, 'wb') as f:
+            for i in range(n):
+                f.write(orjson.dumps({'id': self.ids[i], 'metadata': self.metadatas[i]}))
+                f.write(b'\n')
+
+        print(f"\nSaved {n} vectors to {output_file}")
+        print(f"Metadata sidecar: {metadata_file}")
+        print(f"Embedding matrix shape: {embeddings.shape} (float32)")
+
+    def save_to_f32(self, output_file: str, namespace: str = "mutual-fund-docs") -> None:
+        """
+        Save vectors as a small header JSON plus a raw float32 sidecar
+
+        The sidecar stores the embedding matrix as flat little-endian
+        float32 bytes (vector i starts at byte offset i*dim*4), so
+        upload scripts can np.memmap it and slice batches with zero
+        parsing instead of boxing every float through JSON.
+
+        Args:
+            output_file: Header JSON path; the sidecar is written next
+                         to it with a .f32 extension
+            namespace: Pinecone namespace
+        """
+        n = len(self.embeddings)
+        if n == 0:
+            print("No vectors with embeddings to save!")
+            return
+
+        embeddings = np.stack([
+            np.asarray(row) for row in self.embeddings
+        ]).astype(np.float32)
+
+        f32_file = os.path.splitext(output_file)[0] + '.f32'
+        embeddings.tofile(f32_file)
+
+        header = {
+            'ids': self.ids[:n],
+            'metadata': self.metadatas[:n],
+            'namespace': namespace,
+            'dimension': int(embeddings.shape[1]),
+        }
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(header, option=orjson.OPT_INDENT_2))
+
+        print(f"\nSaved {n} vectors to {output_file}")
+        print(f"Values sidecar: {f32_file} ({embeddings.nbytes} bytes)")
+
 
 def main():
     """
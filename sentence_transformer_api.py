@@ -4,25 +4,325 @@ Runs locally on http://localhost:8000
 No API keys required - uses local Sentence Transformers model
 """
 
+import os
+
+# Configure BLAS/OpenMP thread counts before numpy/torch are imported -
+# the MiniLM GEMMs dominate inference time and PyTorch's defaults
+# (all logical cores, SMT included) are often slower than one thread
+# per physical core
+N_THREADS = int(os.environ.get('TORCH_THREADS', max(1, (os.cpu_count() or 2) // 2)))
+os.environ.setdefault('OMP_NUM_THREADS', str(N_THREADS))
+os.environ.setdefault('MKL_NUM_THREADS', str(N_THREADS))
+
+from collections import OrderedDict
 from flask import Flask, request, jsonify
 from sentence_transformers import SentenceTransformer
-import os
+import hashlib
+import logging
+import numpy as np
+import orjson
+import queue
 import sys
+import threading
+import time
+import torch
+
+torch.set_num_threads(N_THREADS)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    pass  # already initialized
+
+# Pin to the first N cores so the scheduler does not migrate BLAS threads
+if hasattr(os, 'sched_setaffinity'):
+    try:
+        os.sched_setaffinity(0, set(range(N_THREADS)))
+    except OSError:
+        pass
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 app = Flask(__name__)
 
-# Load the model once at startup
+# Per-request logging goes through a leveled logger (silent by default
+# at WARNING) instead of print: print grabs a GIL-held lock and writes
+# synchronously to stdout on every call, which serializes worker threads
+# at high QPS. Set LOG_LEVEL=DEBUG to see per-request lines.
+logger = logging.getLogger('embed')
+logger.setLevel(os.environ.get('LOG_LEVEL', 'WARNING').upper())
+_log_handler = logging.StreamHandler(sys.stderr)
+_log_handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(levelname)s %(message)s'))
+logger.addHandler(_log_handler)
+
+MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+ONNX_DIR = os.environ.get('ONNX_MODEL_DIR', './onnx_model')
+
+
+class ONNXEncoder:
+    """
+    Drop-in encode() replacement backed by an INT8 ONNX Runtime session
+
+    Exports all-MiniLM-L6-v2 to ONNX and applies dynamic INT8
+    quantization (VNNI int8 dot products) on first startup, then reuses
+    the cached model. 2-4x faster than the PyTorch eager path on CPU
+    with ~4x smaller weights.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, cache_dir: str = ONNX_DIR):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        quantized_path = os.path.join(cache_dir, 'model_quantized.onnx')
+        if not os.path.exists(quantized_path):
+            print("Exporting model to ONNX and quantizing to INT8 (one-time)...")
+            export = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            export.save_pretrained(cache_dir)
+            quantizer = ORTQuantizer.from_pretrained(cache_dir)
+            quantizer.quantize(
+                save_dir=cache_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False)
+            )
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            cache_dir, file_name='model_quantized.onnx'
+        )
+        self.dimension = self.model.config.hidden_size
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        """Tokenize, run the ONNX session, mean-pool and L2-normalize"""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=256,
+            return_tensors='np'
+        )
+        hidden = self.model(**encoded).last_hidden_state
+
+        # Mean pooling over non-padding tokens, then L2 normalize
+        mask = encoded['attention_mask'][..., None].astype(np.float32)
+        embeddings = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        embeddings = (embeddings / norms).astype(np.float32)
+
+        return embeddings[0] if single else embeddings
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+
+# Load the model once at startup. The ONNX INT8 path is preferred; set
+# EMB_BACKEND=torch to force the PyTorch model.
 print("=" * 60)
-print("Loading Sentence Transformer model: all-MiniLM-L6-v2")
+print("Loading embedding model: all-MiniLM-L6-v2")
 print("=" * 60)
-try:
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    print("✓ Model loaded successfully!")
-    print(f"✓ Embedding dimension: {model.get_sentence_embedding_dimension()}")
-    print("=" * 60)
-except Exception as e:
-    print(f"✗ Error loading model: {e}")
-    sys.exit(1)
+model = None
+if os.environ.get('EMB_BACKEND', 'onnx') == 'onnx':
+    try:
+        model = ONNXEncoder()
+        print("✓ ONNX Runtime INT8 model loaded successfully!")
+    except Exception as e:
+        print(f"! ONNX backend unavailable ({e}), falling back to PyTorch")
+
+if model is None:
+    try:
+        model = SentenceTransformer('all-MiniLM-L6-v2')
+        model.eval()
+        # Make sure the Rust fast tokenizer is in use - the pure-Python
+        # tokenizer is a measurable slice of encode() on short texts
+        try:
+            from transformers import AutoTokenizer
+            if not getattr(model._first_module().tokenizer, 'is_fast', False):
+                model._first_module().tokenizer = AutoTokenizer.from_pretrained(
+                    MODEL_NAME, use_fast=True
+                )
+        except Exception:
+            pass
+        print("✓ Model loaded successfully!")
+    except Exception as e:
+        print(f"✗ Error loading model: {e}")
+        sys.exit(1)
+
+print(f"✓ Embedding dimension: {model.get_sentence_embedding_dimension()}")
+print("=" * 60)
+
+# EMB_DTYPE=bf16 runs the PyTorch path under bfloat16 autocast - halves
+# weight/activation bytes and roughly doubles throughput on
+# AVX512-BF16/AMX hosts with negligible cosine drift. Only relevant to
+# the SentenceTransformer fallback; the ONNX backend is already INT8.
+_AUTOCAST_BF16 = (
+    os.environ.get('EMB_DTYPE', 'fp32').lower() in ('bf16', 'bfloat16')
+    and isinstance(model, SentenceTransformer)
+)
+if _AUTOCAST_BF16:
+    print("Using bfloat16 autocast for encoding")
+
+def _model_encode(texts, **kwargs):
+    """
+    model.encode with optional bf16 autocast and no autograd
+
+    Embeddings come back L2-normalized inside the encode kernel
+    (Pinecone cosine on normalized vectors is a plain dot product, and
+    this saves clients a second normalization pass) as a contiguous
+    float32 array. The ONNX backend normalizes in its own pipeline and
+    ignores the kwarg.
+    """
+    kwargs.setdefault('normalize_embeddings', True)
+    if _AUTOCAST_BF16:
+        with torch.inference_mode(), torch.autocast(device_type='cpu', dtype=torch.bfloat16):
+            embeddings = model.encode(texts, **kwargs)
+    elif isinstance(model, SentenceTransformer):
+        # inference_mode drops autograd bookkeeping on every forward
+        with torch.inference_mode():
+            embeddings = model.encode(texts, **kwargs)
+    else:
+        embeddings = model.encode(texts, **kwargs)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+# Warm up the encoder once at startup. The first forward pass pays for
+# kernel dispatch, workspace allocation and (on the ONNX path) session
+# initialization - without this the first /embed request can be 10-100x
+# slower than steady state.
+_ = _model_encode(["warmup"] * 8, batch_size=8, convert_to_numpy=True)
+print("✓ Encoder warmed up")
+
+def orjson_response(payload, status: int = 200):
+    """
+    Serialize a response with orjson instead of Flask's jsonify
+
+    OPT_SERIALIZE_NUMPY writes numpy arrays directly, skipping the
+    .tolist() conversion that allocates one Python float per component.
+    """
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+# Adaptive micro-batching for /embed: concurrent requests are pulled off
+# a queue for up to MAX_WAIT_MS (or until MAX_BATCH texts are pending)
+# and encoded in one fused forward pass, amortizing tokenizer and model
+# launch overhead across requests.
+MAX_BATCH = 32
+MAX_WAIT_MS = 10
+
+_request_queue = queue.Queue()
+
+def _batch_worker():
+    while True:
+        item = _request_queue.get()
+        batch = [item]
+        deadline = time.monotonic() + MAX_WAIT_MS / 1000.0
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_request_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        texts = [it['text'] for it in batch]
+        try:
+            embeddings = _model_encode(texts, batch_size=MAX_BATCH, convert_to_numpy=True)
+            for it, embedding in zip(batch, embeddings):
+                it['result'] = embedding
+        except Exception as e:
+            for it in batch:
+                it['error'] = e
+        for it in batch:
+            it['event'].set()
+
+threading.Thread(target=_batch_worker, daemon=True, name='embed-batcher').start()
+
+def encode_batched(text: str):
+    """Enqueue a text for the micro-batching worker and wait for its row"""
+    item = {'text': text, 'event': threading.Event(), 'result': None, 'error': None}
+    _request_queue.put(item)
+    item['event'].wait()
+    if item['error'] is not None:
+        raise item['error']
+    return item['result']
+
+# Two-tier embedding cache: a bounded in-process LRU in front of an
+# optional diskcache that survives restarts. Entries are stored as fp16
+# bytes (cosine similarity is robust to fp16), halving the footprint.
+# An explicit OrderedDict is used instead of functools.lru_cache so the
+# batch endpoint can fill all its misses with a single encode call; the
+# lock keeps eviction safe under the gthread worker threads.
+_MEM_CACHE = OrderedDict()
+_MEM_CACHE_MAX = 10000
+_MEM_CACHE_LOCK = threading.Lock()
+_DISK_CACHE = diskcache.Cache(os.environ.get('EMB_CACHE_DIR', './emb_cache')) if diskcache else None
+
+def _cache_key(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def _cache_lookup(text: str):
+    """Return a cached embedding for text, or None"""
+    with _MEM_CACHE_LOCK:
+        embedding = _MEM_CACHE.get(text)
+        if embedding is not None:
+            _MEM_CACHE.move_to_end(text)
+            return embedding
+    if _DISK_CACHE is not None:
+        blob = _DISK_CACHE.get(_cache_key(text))
+        if blob is not None:
+            embedding = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+            _cache_put_mem(text, embedding)
+            return embedding
+    return None
+
+def _cache_put_mem(text: str, embedding) -> None:
+    with _MEM_CACHE_LOCK:
+        if text not in _MEM_CACHE and len(_MEM_CACHE) >= _MEM_CACHE_MAX:
+            _MEM_CACHE.popitem(last=False)
+        _MEM_CACHE[text] = embedding
+        _MEM_CACHE.move_to_end(text)
+
+def _cache_store(text: str, embedding) -> None:
+    _cache_put_mem(text, embedding)
+    if _DISK_CACHE is not None:
+        _DISK_CACHE.set(_cache_key(text), np.asarray(embedding, dtype=np.float16).tobytes())
+
+def encode_cached(text: str):
+    """Encode one text, serving repeats from the cache"""
+    embedding = _cache_lookup(text)
+    if embedding is None:
+        embedding = encode_batched(text)
+        _cache_store(text, embedding)
+    return embedding
+
+def encode_length_bucketed(texts):
+    """
+    Encode texts in length-sorted sub-batches, then restore input order
+
+    model.encode pads every sample to the longest in its batch, so mixed
+    lengths burn most FLOPs on padding tokens. Sorting by length keeps
+    each 32-text sub-batch homogeneous; the inverse permutation puts the
+    rows back in request order.
+    """
+    order = np.argsort([len(t) for t in texts], kind='stable')
+    encoded = [
+        _model_encode(
+            [texts[j] for j in order[i:i + MAX_BATCH]],
+            batch_size=MAX_BATCH,
+            convert_to_numpy=True
+        )
+        for i in range(0, len(order), MAX_BATCH)
+    ]
+    stacked = np.vstack(encoded)
+    return stacked[np.argsort(order, kind='stable')]
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -77,19 +377,100 @@ def embed():
                 "error": "Text must be a non-empty string"
             }), 400
         
-        # Generate embedding
-        print(f"Generating embedding for: {text[:50]}...")
-        embedding = model.encode(text, convert_to_numpy=True).tolist()
-        
-        return jsonify({
+        # Generate embedding (cached; batched with concurrent requests)
+        logger.debug("Generating embedding for: %.50s...", text)
+        embedding = np.asarray(encode_cached(text), dtype=np.float32)
+
+        return orjson_response({
             "embedding": embedding,
-            "dimension": len(embedding),
+            "dimension": int(embedding.shape[-1]),
             "model": "all-MiniLM-L6-v2",
             "text": text  # Echo back the text for verification
-        }), 200
-        
+        })
+
+    except Exception as e:
+        logger.error("Error in /embed: %s", e)
+        return jsonify({
+            "error": str(e)
+        }), 500
+
+@app.route('/embed/bin', methods=['POST'])
+def embed_bin():
+    """
+    Fast-path embedding endpoint returning raw little-endian float32 bytes
+
+    Same request body as /embed; the response is the bare vector as
+    application/octet-stream with the dimension in the
+    X-Embedding-Dimension header. Skips JSON serialization entirely.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+
+        data = request.get_json()
+        text = (data or {}).get('text') or (data or {}).get('query')
+        if not text or not isinstance(text, str) or len(text.strip()) == 0:
+            return jsonify({"error": "Missing 'text' or 'query' field in request body"}), 400
+
+        embedding = np.asarray(encode_cached(text), dtype=np.float32)
+        response = app.response_class(embedding.tobytes(), mimetype='application/octet-stream')
+        response.headers['X-Embedding-Dimension'] = str(embedding.shape[-1])
+        return response
+
+    except Exception as e:
+        logger.error("Error in /embed/bin: %s", e)
+        return jsonify({
+            "error": str(e)
+        }), 500
+
+# Typed msgpack request schema: msgspec decodes and validates the body
+# in one C-level call, versus request.get_json() plus dict lookups.
+if msgspec is not None:
+    from typing import Optional
+
+    class EmbedReq(msgspec.Struct):
+        text: Optional[str] = None
+        query: Optional[str] = None
+
+    _msgpack_decoder = msgspec.msgpack.Decoder(EmbedReq)
+
+@app.route('/embed/msgpack', methods=['POST'])
+def embed_msgpack():
+    """
+    Binary embedding endpoint speaking msgpack in both directions
+
+    Accepts a msgpack-encoded {"text": ...} (or {"query": ...}) body and
+    returns msgpack {"embedding": [...], "dimension": ..., "model": ...}
+    as application/x-msgpack. Parsing and serialization each run as a
+    single C call, skipping the per-request JSON overhead.
+    """
+    if msgspec is None:
+        return jsonify({"error": "msgspec is not installed on the server"}), 501
+
+    try:
+        try:
+            req = _msgpack_decoder.decode(request.get_data())
+        except msgspec.DecodeError as e:
+            return jsonify({"error": f"Invalid msgpack body: {e}"}), 400
+
+        text = req.text or req.query
+        if not text or len(text.strip()) == 0:
+            return jsonify({"error": "Missing 'text' or 'query' field in request body"}), 400
+
+        logger.debug("Generating embedding (msgpack) for: %.50s...", text)
+        embedding = np.asarray(encode_cached(text), dtype=np.float32)
+
+        return app.response_class(
+            msgspec.msgpack.encode({
+                "embedding": embedding.tolist(),
+                "dimension": int(embedding.shape[-1]),
+                "model": "all-MiniLM-L6-v2"
+            }),
+            mimetype='application/x-msgpack'
+        )
+
     except Exception as e:
-        print(f"Error in /embed: {e}")
+        logger.error("Error in /embed/msgpack: %s", e)
         return jsonify({
             "error": str(e)
         }), 500
@@ -131,19 +512,41 @@ def embed_batch():
                 "error": "texts must be a non-empty array"
             }), 400
         
-        # Generate embeddings
-        print(f"Generating embeddings for {len(texts)} texts...")
-        embeddings = model.encode(texts, convert_to_numpy=True).tolist()
-        
-        return jsonify({
+        # Generate embeddings, serving repeats from the cache and
+        # encoding all misses in length-homogeneous sub-batches
+        logger.debug("Generating embeddings for %d texts...", len(texts))
+        results = [None] * len(texts)
+        miss_texts = []
+        miss_indices = []
+        for i, text in enumerate(texts):
+            cached = _cache_lookup(text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                miss_texts.append(text)
+                miss_indices.append(i)
+
+        if miss_texts:
+            # Encode each distinct text once - n8n workflows often repeat
+            # fund names or prompts within a batch - and scatter the rows
+            # back to every duplicate position via the inverse map
+            uniq, inverse = np.unique(np.array(miss_texts, dtype=object), return_inverse=True)
+            encoded = encode_length_bucketed(list(uniq))[inverse]
+            for i, text, embedding in zip(miss_indices, miss_texts, encoded):
+                _cache_store(text, embedding)
+                results[i] = embedding
+
+        embeddings = [np.asarray(r, dtype=np.float32) for r in results]
+
+        return orjson_response({
             "embeddings": embeddings,
             "count": len(embeddings),
-            "dimension": len(embeddings[0]) if embeddings else 0,
+            "dimension": int(embeddings[0].shape[-1]) if embeddings else 0,
             "model": "all-MiniLM-L6-v2"
-        }), 200
+        })
         
     except Exception as e:
-        print(f"Error in /embed/batch: {e}")
+        logger.error("Error in /embed/batch: %s", e)
         return jsonify({
             "error": str(e)
         }), 500
@@ -152,7 +555,7 @@ def embed_batch():
 def not_found(error):
     return jsonify({
         "error": "Endpoint not found",
-        "available_endpoints": ["/health", "/embed", "/embed/batch"]
+        "available_endpoints": ["/health", "/embed", "/embed/bin", "/embed/msgpack", "/embed/batch"]
     }), 404
 
 @app.errorhandler(500)
@@ -166,12 +569,16 @@ if __name__ == '__main__':
     host = os.environ.get('HOST', '0.0.0.0')
     
     print("=" * 60)
-    print(f"Starting Sentence Transformer API server")
+    print(f"Starting Sentence Transformer API server (development mode)")
     print(f"Host: {host}")
     print(f"Port: {port}")
     print(f"Health check: http://{host}:{port}/health")
     print(f"Embed endpoint: http://{host}:{port}/embed")
+    print("For production use: gunicorn -c gunicorn_conf.py sentence_transformer_api:app")
     print("=" * 60)
-    
-    app.run(host=host, port=port, debug=False)
+
+    # Werkzeug dev server for local testing only; threaded=True at least
+    # lets concurrent requests overlap. Deploy under gunicorn (gthread)
+    # for real load - see gunicorn_conf.py.
+    app.run(host=host, port=port, debug=False, threaded=True)
 
@@ -1,47 +1,163 @@
 """
 Script to upload Pinecone-compatible JSON file to Pinecone vector database
 """
-import json
+import base64
+import ijson
+import itertools
+import orjson
 import os
-from pinecone import Pinecone, ServerlessSpec
-from typing import List, Dict, Any
+import numpy as np
+from collections import deque
+try:
+    # gRPC client: persistent HTTP/2 channel, noticeably faster upserts
+    from pinecone.grpc import PineconeGRPC as Pinecone
+    GRPC_CLIENT = True
+except ImportError:
+    from pinecone import Pinecone
+    GRPC_CLIENT = False
+from pinecone import ServerlessSpec, NotFoundException
+from typing import Iterable, Dict, Any
 import time
 
-def load_json_file(file_path: str) -> Dict[str, Any]:
+# Maximum number of async upsert batches in flight at once
+MAX_IN_FLIGHT = 20
+
+def wait_for_upsert(handle):
+    """Wait on an async upsert result from either client flavor"""
+    if hasattr(handle, 'result'):
+        return handle.result()  # gRPC PineconeGrpcFuture
+    return handle.get()  # REST AsyncResult
+
+class TokenBucket:
     """
-    Load the Pinecone JSON file
-    
+    Simple token-bucket rate limiter
+
+    Allows `rate` operations per second with short bursts up to the
+    bucket capacity, instead of a fixed sleep after every operation.
+    """
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity if capacity else max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+def chunks(iterable, batch_size: int = 100):
+    """Break an iterable into batches of batch_size"""
+    it = iter(iterable)
+    batch = list(itertools.islice(it, batch_size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(it, batch_size))
+
+def decode_values(vec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode base64-encoded fp16 values written by the scraper's float16
+    format back to a float32 list; plain float32 vectors pass through
+    """
+    if 'values_fp16_b64' in vec:
+        raw = base64.b64decode(vec.pop('values_fp16_b64'))
+        vec['values'] = np.frombuffer(raw, dtype=np.float16).astype(np.float32).tolist()
+    return vec
+
+def iter_vectors_f32(file_path: str, f32_file: str):
+    """
+    Stream vectors from a header JSON plus raw float32 memmap sidecar
+
+    The header holds ids, metadata and the dimension; the sidecar is the
+    flat embedding matrix written by the scraper's save_to_f32. np.memmap
+    gives zero-copy access, so the only per-vector cost is the .tolist()
+    at the upsert boundary.
+
+    Args:
+        file_path: Path to the header JSON
+        f32_file: Path to the .f32 values sidecar
+
+    Yields:
+        Vector dictionaries with id, values and metadata
+    """
+    with open(file_path, 'rb') as f:
+        header = orjson.loads(f.read())
+    mm = np.memmap(f32_file, dtype=np.float32, mode='r').reshape(-1, header['dimension'])
+    ids = header['ids']
+    metadatas = header.get('metadata') or [{} for _ in ids]
+    for i in range(len(ids)):
+        yield {"id": ids[i], "values": mm[i].tolist(), "metadata": metadatas[i]}
+
+def iter_vectors(file_path: str):
+    """
+    Stream vectors from the Pinecone JSON file one at a time
+
+    Unlike json.load, this never materializes the whole vectors array,
+    so peak memory stays at one batch rather than the full file. When a
+    .f32 sidecar sits next to the file, values are memmapped from it
+    instead of parsed out of the JSON.
+
     Args:
         file_path: Path to the JSON file
-        
-    Returns:
-        Dictionary with vectors and metadata
+
+    Yields:
+        Vector dictionaries with id, values and metadata
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
+    f32_file = os.path.splitext(file_path)[0] + '.f32'
+    if os.path.exists(f32_file):
+        yield from iter_vectors_f32(file_path, f32_file)
+        return
+    with open(file_path, 'rb') as f:
+        for vec in ijson.items(f, 'vectors.item', use_float=True):
+            yield decode_values(vec)
+
+def read_namespace(file_path: str) -> str:
+    """Read just the namespace field without parsing the vectors"""
+    with open(file_path, 'rb') as f:
+        return next(ijson.items(f, 'namespace'), None)
 
 def upload_to_pinecone(
     api_key: str,
     index_name: str,
-    vectors: List[Dict[str, Any]],
+    vectors: Iterable[Dict[str, Any]],
     namespace: str = None,
     batch_size: int = 100
 ):
     """
     Upload vectors to Pinecone
-    
+
     Args:
         api_key: Pinecone API key
         index_name: Name of the Pinecone index
-        vectors: List of vectors to upload
+        vectors: Iterable of vectors to upload (list or generator)
         namespace: Namespace in Pinecone (optional)
         batch_size: Number of vectors to upload per batch
     """
     # Initialize Pinecone client
     print(f"Connecting to Pinecone...")
     pc = Pinecone(api_key=api_key)
-    
+
+    # Peek the first vector for the dimension, then stitch it back onto
+    # the stream - the total count is only known for list inputs
+    total_vectors = len(vectors) if hasattr(vectors, '__len__') else None
+    it = iter(vectors)
+    first = next(it, None)
+    if first is None:
+        print("Error: No vectors to upload!")
+        return
+    vectors = itertools.chain([first], it)
+    dimension = len(first['values'])
+
+    # When vectors already have exactly the keys Pinecone expects, skip
+    # the per-vector dict rebuild in the hot loop entirely
+    fast_path = set(first.keys()) <= {"id", "values", "metadata"}
+
     # Check if index exists
     print(f"Checking index: {index_name}")
     existing_indexes = [index.name for index in pc.list_indexes()]
@@ -52,8 +168,6 @@ def upload_to_pinecone(
         create = input(f"\nWould you like to create index '{index_name}'? [y/N]: ").strip().lower()
         
         if create == 'y':
-            # Get dimension from first vector
-            dimension = len(vectors[0]['values']) if vectors else 384
             print(f"Creating index '{index_name}' with dimension {dimension}...")
             
             # Create index (using ServerlessSpec - adjust if using different spec)
@@ -67,40 +181,90 @@ def upload_to_pinecone(
                 )
             )
             
-            # Wait for index to be ready
+            # Wait until the index reports ready - one describe call per
+            # poll instead of listing every index, and no blind extra
+            # sleep once the status flips
             print("Waiting for index to be ready...")
-            while index_name not in [index.name for index in pc.list_indexes()]:
-                time.sleep(1)
-            time.sleep(5)  # Additional wait for index to be fully ready
+            backoff = 1.0
+            while True:
+                try:
+                    if pc.describe_index(index_name).status['ready']:
+                        break
+                except NotFoundException:
+                    pass
+                time.sleep(min(4, backoff))
+                backoff *= 1.5
             print("Index created successfully!")
         else:
             print("Exiting. Please create the index manually or provide an existing index name.")
             return
     
-    # Connect to the index
+    # Connect once via the index's data-plane host: describe_index
+    # resolves the host a single time up front, and the handle (with its
+    # persistent connection) is reused for every batch in the session
     print(f"\nConnecting to index: {index_name}")
-    index = pc.Index(index_name)
-    
+    host = pc.describe_index(index_name).host
+    if GRPC_CLIENT:
+        index = pc.Index(host=host)
+    else:
+        index = pc.Index(index_name, host=host, pool_threads=MAX_IN_FLIGHT)
+
     # Get index stats
     stats = index.describe_index_stats()
     print(f"Index stats: {stats}")
-    
-    # Upload vectors in batches
-    total_vectors = len(vectors)
-    print(f"\nUploading {total_vectors} vectors to Pinecone...")
+
+    # Upload vectors in pipelined batches: each batch is submitted with
+    # async_req=True and up to MAX_IN_FLIGHT requests overlap, instead
+    # of paying one network round-trip per batch serially
+    total_label = total_vectors if total_vectors is not None else '?'
+    print(f"\nUploading {total_label} vectors to Pinecone...")
     print(f"Using namespace: {namespace if namespace else 'default'}")
-    print(f"Batch size: {batch_size}")
+    print(f"Batch size: {batch_size} ({'gRPC' if GRPC_CLIENT else 'REST'}, {MAX_IN_FLIGHT} batches in flight)")
     print("-" * 60)
-    
+
+    # Token bucket instead of a blanket sleep between batches: upserts
+    # run full-throttle until the server actually pushes back
+    limiter = TokenBucket(rate=10)
+
     uploaded = 0
-    for i in range(0, total_vectors, batch_size):
-        batch = vectors[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (total_vectors + batch_size - 1) // batch_size
-        
-        print(f"Uploading batch {batch_num}/{total_batches} ({len(batch)} vectors)...")
-        
-        try:
+    in_flight = deque()
+
+    def submit(formatted_batch):
+        limiter.acquire()
+        if namespace:
+            return index.upsert(vectors=formatted_batch, namespace=namespace, async_req=True)
+        return index.upsert(vectors=formatted_batch, async_req=True)
+
+    def drain_one():
+        """Wait for the oldest in-flight batch, retrying on HTTP 429"""
+        nonlocal uploaded
+        handle, formatted_batch = in_flight.popleft()
+        backoff = 1.0
+        for attempt in range(5):
+            try:
+                wait_for_upsert(handle)
+                break
+            except Exception as e:
+                if getattr(e, 'status', None) == 429 and attempt < 4:
+                    headers = getattr(e, 'headers', None) or {}
+                    try:
+                        wait = float(headers.get('Retry-After', 0)) or backoff
+                    except (TypeError, ValueError):
+                        wait = backoff
+                    print(f"  Rate limited, retrying in {wait:.1f}s...")
+                    time.sleep(wait)
+                    backoff *= 2
+                    handle = submit(formatted_batch)
+                else:
+                    print(f"  ✗ Error uploading batch: {str(e)}")
+                    raise
+        uploaded += len(formatted_batch)
+        print(f"  ✓ Uploaded {uploaded}/{total_label} vectors")
+
+    for batch in chunks(vectors, batch_size):
+        if fast_path:
+            formatted_batch = batch
+        else:
             # Format vectors for Pinecone v8 API
             # Pinecone expects: [{"id": "...", "values": [...], "metadata": {...}}, ...]
             formatted_batch = []
@@ -111,23 +275,14 @@ def upload_to_pinecone(
                     "metadata": vec.get("metadata", {})
                 }
                 formatted_batch.append(formatted_vec)
-            
-            # Upload batch
-            if namespace:
-                index.upsert(vectors=formatted_batch, namespace=namespace)
-            else:
-                index.upsert(vectors=formatted_batch)
-            
-            uploaded += len(batch)
-            print(f"  ✓ Uploaded {uploaded}/{total_vectors} vectors")
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"  ✗ Error uploading batch: {str(e)}")
-            raise
-    
+
+        in_flight.append((submit(formatted_batch), formatted_batch))
+        if len(in_flight) >= MAX_IN_FLIGHT:
+            drain_one()
+
+    while in_flight:
+        drain_one()
+
     print("-" * 60)
     print(f"\n✓ Successfully uploaded {uploaded} vectors to Pinecone!")
     
@@ -158,21 +313,18 @@ def main():
         print(f"Error: File '{json_file}' not found!")
         return
     
-    # Load JSON file
+    # Inspect the JSON file - vectors themselves stream during upload,
+    # so only the namespace and first vector are parsed here
     print(f"\nLoading JSON file: {json_file}")
     try:
-        data = load_json_file(json_file)
-        vectors = data.get('vectors', [])
-        namespace = data.get('namespace', None)
-        
-        if not vectors:
+        namespace = read_namespace(json_file)
+        if next(iter_vectors(json_file), None) is None:
             print("Error: No vectors found in JSON file!")
             return
-        
-        print(f"Loaded {len(vectors)} vectors from JSON file")
+
         if namespace:
             print(f"Namespace from file: {namespace}")
-        
+
     except Exception as e:
         print(f"Error loading JSON file: {str(e)}")
         return
@@ -210,7 +362,7 @@ def main():
         upload_to_pinecone(
             api_key=api_key,
             index_name=index_name,
-            vectors=vectors,
+            vectors=iter_vectors(json_file),
             namespace=namespace,
             batch_size=batch_size
         )